@@ -1,13 +1,274 @@
 """Regional rollout campaign planner."""
 
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
-from collections import defaultdict
-import math
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import date, datetime, timedelta
+from collections import namedtuple
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
 
 from ..analyzers.regional_scorer import RegionalScorer
 
 
+# Weekly activity playbook, bucketed by weeks remaining until release
+_WEEKLY_ACTIVITY_THRESHOLDS = (2, 4, 6)
+_WEEKLY_ACTIVITIES = (
+    (
+        "Final push - all channels",
+        "Leverage reviews & testimonials",
+        "Drive ticket sales"
+    ),
+    (
+        "Intensify digital ads",
+        "Launch ticket pre-sales",
+        "Host premiere events"
+    ),
+    (
+        "Release official trailer",
+        "Start paid social campaigns",
+        "Begin PR tour"
+    ),
+    (
+        "Launch teaser campaign",
+        "Build social media presence",
+        "Secure media partnerships"
+    )
+)
+
+# Phase budget weights per tier: base + min(count * step, cap)
+_PHASE_TIERS = ('A', 'B', 'C')
+_TIER_WEIGHT_BASE = np.array([40, 30, 20])
+_TIER_WEIGHT_STEP = np.array([4, 3, 2])
+_TIER_WEIGHT_CAP = np.array([20, 15, 10])
+
+# Marketing channel mix per region tier (shared across plans)
+_TIER_A_CHANNELS = (
+    'TV spots (prime time)',
+    'YouTube pre-roll',
+    'Instagram/Facebook ads',
+    'Outdoor billboards (major cities)',
+    'Influencer partnerships',
+    'Podcast sponsorships'
+)
+_TIER_B_CHANNELS = (
+    'Digital video ads',
+    'Social media ads',
+    'Streaming platform ads',
+    'Local radio spots'
+)
+_TIER_C_CHANNELS = (
+    'Social media organic',
+    'Display ads',
+    'Email campaigns',
+    'Search engine marketing'
+)
+
+# Positioning copy keyed by primary genre
+_GENRE_FOCUS_MAP = {
+    'Action': 'high-impact action beats',
+    'Adventure': 'world-building spectacle',
+    'Science Fiction': 'immersive sci-fi worldbuilding',
+    'Fantasy': 'mythic fantasy imagery',
+    'Animation': 'signature animation style',
+    'Drama': 'character-driven drama',
+    'Comedy': 'sharp comedic timing',
+    'Horror': 'edge-of-seat suspense',
+    'Thriller': 'white-knuckle thrills',
+    'Romance': 'sweeping romantic stakes',
+    'Documentary': 'truth-first storytelling'
+}
+
+_AUDIENCE_MAP = {
+    'Action': 'action seekers',
+    'Adventure': 'genre fans',
+    'Science Fiction': 'sci-fi faithful',
+    'Fantasy': 'fantasy fandoms',
+    'Animation': 'family audiences',
+    'Drama': 'prestige audiences',
+    'Comedy': 'comedy lovers',
+    'Horror': 'thrill seekers',
+    'Thriller': 'thriller fans',
+    'Romance': 'date-night audiences',
+    'Documentary': 'non-fiction fans'
+}
+
+
+# Column-oriented view of ranked regions (one array per field)
+RankedRegions = namedtuple('RankedRegions', 'regions tiers pcts scores recs')
+
+
+@dataclass(frozen=True)
+class RegionalSummary:
+    """Tier counts and groupings shared by the planning helpers."""
+    # Declared by hand: dataclass(slots=True) needs Python 3.10+
+    __slots__ = ('tier_a_count', 'tier_b_count', 'tier_c_count', 'top3_mean', 'regions_by_tier')
+    
+    tier_a_count: int
+    tier_b_count: int
+    tier_c_count: int
+    top3_mean: Optional[float]
+    regions_by_tier: Dict[str, List[str]]
+
+
+@dataclass
+class PhaseRecord:
+    """A single rollout phase."""
+    __slots__ = (
+        'phase', 'name', 'start_date', 'duration_weeks', 'regions',
+        'intensity', 'focus', 'budget_percentage', 'movie_hook'
+    )
+    
+    phase: int
+    name: str
+    start_date: str
+    duration_weeks: int
+    regions: List[str]
+    intensity: str
+    focus: str
+    budget_percentage: int
+    movie_hook: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'phase': self.phase,
+            'name': self.name,
+            'start_date': self.start_date,
+            'duration_weeks': self.duration_weeks,
+            'regions': self.regions,
+            'intensity': self.intensity,
+            'focus': self.focus,
+            'budget_percentage': self.budget_percentage,
+            'movie_hook': self.movie_hook
+        }
+
+
+@dataclass
+class TimelineWeek:
+    """One week of the campaign timeline."""
+    __slots__ = (
+        'week', 'start_date', 'end_date', 'phase',
+        'active_regions', 'key_activities', 'intensity'
+    )
+    
+    week: int
+    start_date: str
+    end_date: str
+    phase: str
+    active_regions: List[str]
+    key_activities: Tuple[str, ...]
+    intensity: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'week': self.week,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'phase': self.phase,
+            'active_regions': self.active_regions,
+            'key_activities': self.key_activities,
+            'intensity': self.intensity
+        }
+
+
+@dataclass
+class Milestone:
+    """A key campaign milestone."""
+    __slots__ = ('date', 'milestone', 'description')
+    
+    date: str
+    milestone: str
+    description: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            'date': self.date,
+            'milestone': self.milestone,
+            'description': self.description
+        }
+
+
+def _budget_core(
+    production_budget: float,
+    popularity: float,
+    tier_a_count: int,
+    tier_b_count: int,
+    interest_index: float,
+    vote_count: int
+) -> Tuple[float, float, float, float, float, float]:
+    """Numeric core of the budget derivation.
+    
+    Returns (total_budget, marketing_ratio, popularity_factor, tier_factor,
+    interest_factor, audience_factor).
+    """
+    if production_budget > 0:
+        if production_budget >= 150_000_000:
+            marketing_ratio = 0.4
+        elif production_budget >= 75_000_000:
+            marketing_ratio = 0.32
+        elif production_budget >= 25_000_000:
+            marketing_ratio = 0.25
+        else:
+            marketing_ratio = 0.18
+        base_budget = production_budget * marketing_ratio
+    else:
+        marketing_ratio = 0.0
+        base_budget = 350000.0
+    
+    pop_score = max(0.0, min(popularity, 100.0))
+    popularity_factor = 1.0 + (pop_score / 100.0) * 0.35
+    tier_factor = 1.0 + min(tier_a_count, 4) * 0.08 + min(tier_b_count, 4) * 0.03
+    interest_factor = 1.0 + max(0.0, interest_index - 0.55) * 0.5
+    audience_factor = 1.0 + min(vote_count / 50000.0, 1.0) * 0.15 if vote_count else 1.0
+    
+    base_budget = base_budget * popularity_factor * tier_factor * interest_factor * audience_factor
+    computed_budget = max(250000.0, min(base_budget, 20000000.0))
+    total_budget = max(250000.0, round(computed_budget / 50000.0) * 50000.0)
+    
+    return (
+        total_budget,
+        marketing_ratio,
+        popularity_factor,
+        tier_factor,
+        interest_factor,
+        audience_factor
+    )
+
+
+@lru_cache(maxsize=256)
+def _compute_signature(
+    title: str,
+    primary_genre: str,
+    lead: Optional[str],
+    tagline: str,
+    supporting: Tuple[str, ...]
+) -> Dict[str, Any]:
+    """Build the positioning signature from hashable movie fields (memoized)."""
+    genre_focus = _GENRE_FOCUS_MAP.get(primary_genre, f"{primary_genre.lower()} energy")
+    audience_callout = _AUDIENCE_MAP.get(primary_genre, f"{primary_genre.lower()} fans")
+    
+    if tagline:
+        hook = tagline
+    elif lead:
+        hook = f"{lead}'s {primary_genre.lower()} turn"
+    else:
+        hook = f"fan-favorite {primary_genre.lower()} moments"
+    
+    return {
+        'title': title,
+        'primary_genre': primary_genre,
+        'genre_focus': genre_focus,
+        'hook': hook,
+        'lead': lead or 'the ensemble cast',
+        'tagline': tagline,
+        'audience_callout': audience_callout,
+        'supporting': supporting
+    }
+
+
 class RolloutPlanner:
     """Plan geographic and temporal campaign rollout strategy."""
     
@@ -39,50 +300,65 @@ class RolloutPlanner:
         # Score and rank regions
         comparison = precomputed_comparison or self.scorer.compare_regions(regional_payload)
         ranked_regions = comparison['ranked_regions']
+        ranked = self._columnize(ranked_regions)
+        summary = self._summarize(ranked)
         
         # Parse release date
         try:
-            release_dt = datetime.strptime(release_date, '%Y-%m-%d')
-        except:
-            release_dt = datetime.now() + timedelta(days=60)
+            # Date-only parse keeps release_dt naive (offset strings are rejected)
+            release_dt = datetime.combine(date.fromisoformat(release_date), datetime.min.time())
+        except (ValueError, TypeError):
+            try:
+                # Slow path for dates without zero padding, e.g. '2024-6-5'
+                release_dt = datetime.strptime(release_date, '%Y-%m-%d')
+            except (ValueError, TypeError):
+                release_dt = datetime.now() + timedelta(days=60)
+        release_label = release_dt.strftime('%Y-%m-%d')
         
         movie_signature = self._extract_movie_signature(movie_profile)
         
         planning_parameters = self._derive_campaign_parameters(
             movie_profile or {},
-            comparison,
+            summary,
             budget_total,
             campaign_weeks,
-            release_dt
+            release_dt,
+            release_label
         )
         
         budget_total = planning_parameters['total_budget']
         campaign_weeks = planning_parameters['campaign_weeks']
         
         campaign_start = release_dt - timedelta(weeks=campaign_weeks)
+        start_label = campaign_start.strftime('%Y-%m-%d')
         
         # Create phased rollout
         phases = self._create_phases(
-            ranked_regions,
+            summary,
             campaign_start,
             release_dt,
+            start_label,
             movie_signature,
             campaign_weeks
         )
         
         # Allocate budget
-        budget_allocation = self._allocate_budget(ranked_regions, budget_total)
+        budget_allocation = self._allocate_budget(ranked, budget_total)
         
         # Create timeline
         timeline = self._create_timeline(phases, campaign_start, release_dt)
         
         # Channel recommendations
-        channels = self._recommend_channels(ranked_regions)
+        channels = self._recommend_channels(summary.regions_by_tier)
+        
+        milestones = self._generate_milestones(
+            campaign_start, release_dt, start_label, release_label
+        )
         
         return {
             'campaign_overview': {
                 'release_date': release_date,
-                'campaign_start': campaign_start.strftime('%Y-%m-%d'),
+                'campaign_start': start_label,
                 'duration_weeks': campaign_weeks,
                 'total_budget': budget_total,
                 'target_regions': len(ranked_regions),
@@ -94,29 +370,63 @@ class RolloutPlanner:
                     'tagline': movie_signature['tagline']
                 }
             },
-            'phases': phases,
+            'phases': [phase.to_dict() for phase in phases],
             'budget_allocation': budget_allocation,
-            'timeline': timeline,
+            'timeline': [week.to_dict() for week in timeline],
             'channel_strategy': channels,
-            'key_milestones': self._generate_milestones(campaign_start, release_dt),
+            'key_milestones': [milestone.to_dict() for milestone in milestones],
             'recommendations': comparison['recommendations'],
             'plan_logic': planning_parameters['logic'],
             'budget_duration_logic': planning_parameters['logic']
         }
     
+    def _columnize(
+        self,
+        ranked_regions: List[Dict[str, Any]]
+    ) -> RankedRegions:
+        """Convert ranked region records into parallel arrays."""
+        count = len(ranked_regions)
+        return RankedRegions(
+            regions=np.array([r['region'] for r in ranked_regions], dtype=str),
+            tiers=np.array([r['tier'] for r in ranked_regions], dtype=str),
+            pcts=np.fromiter((r['suggested_budget_pct'] for r in ranked_regions), dtype=np.float64, count=count),
+            scores=np.fromiter((r.get('total_score', 0) for r in ranked_regions), dtype=np.float64, count=count),
+            recs=[r['recommendation'] for r in ranked_regions]
+        )
+    
+    def _summarize(
+        self,
+        ranked: RankedRegions
+    ) -> RegionalSummary:
+        """Group region names by tier and collect demand signals in one pass."""
+        tier_names = dict.fromkeys(_PHASE_TIERS)
+        tier_names.update(dict.fromkeys(ranked.tiers.tolist()))
+        regions_by_tier = {
+            tier: ranked.regions[ranked.tiers == tier].tolist()
+            for tier in tier_names
+        }
+        top_scores = ranked.scores[:3]
+        return RegionalSummary(
+            tier_a_count=len(regions_by_tier['A']),
+            tier_b_count=len(regions_by_tier['B']),
+            tier_c_count=len(regions_by_tier['C']),
+            top3_mean=float(top_scores.mean()) if top_scores.size else None,
+            regions_by_tier=regions_by_tier
+        )
+    
     def _create_phases(
         self,
-        ranked_regions: List[Dict[str, Any]],
+        summary: RegionalSummary,
         start_date: datetime,
         release_date: datetime,
+        start_label: str,
         movie_signature: Dict[str, str],
         campaign_weeks: int
-    ) -> List[Dict[str, Any]]:
+    ) -> List[PhaseRecord]:
         """Create phased rollout schedule."""
-        # Group regions by tier
-        tier_a = [r for r in ranked_regions if r['tier'] == 'A']
-        tier_b = [r for r in ranked_regions if r['tier'] == 'B']
-        tier_c = [r for r in ranked_regions if r['tier'] == 'C']
+        tier_a = summary.regions_by_tier['A']
+        tier_b = summary.regions_by_tier['B']
+        tier_c = summary.regions_by_tier['C']
         
         if not (tier_a or tier_b or tier_c):
             return []
@@ -137,25 +447,19 @@ class RolloutPlanner:
             'C': _offset(0.65, 2)
         }
         
-        # Dynamic budget split weights
-        weight_map = {}
-        if tier_a:
-            weight_map['A'] = 40 + min(len(tier_a) * 4, 20)
-        if tier_b:
-            weight_map['B'] = 30 + min(len(tier_b) * 3, 15)
-        if tier_c:
-            weight_map['C'] = 20 + min(len(tier_c) * 2, 10)
-        
-        total_weight = sum(weight_map.values()) or 1
-        normalized_pct = {}
-        running_total = 0
-        ordered_keys = [k for k in ['A', 'B', 'C'] if k in weight_map]
-        for idx, key in enumerate(ordered_keys):
-            pct = round(weight_map[key] / total_weight * 100)
-            if idx == len(ordered_keys) - 1:
-                pct = 100 - running_total
-            running_total += pct
-            normalized_pct[key] = pct
+        # Dynamic budget split weights (inactive tiers weigh zero)
+        counts = np.array([summary.tier_a_count, summary.tier_b_count, summary.tier_c_count])
+        weights = (_TIER_WEIGHT_BASE + np.minimum(counts * _TIER_WEIGHT_STEP, _TIER_WEIGHT_CAP)) * (counts > 0)
+        total_weight = weights.sum() or 1
+        
+        # Largest-remainder rounding so active tiers sum to exactly 100; integer
+        # remainders keep ties exact so they break in tier order (stable sort)
+        pct, rem = np.divmod(weights * 100, total_weight)
+        active = np.flatnonzero(counts)
+        shortfall = 100 - pct.sum()
+        by_remainder = active[np.argsort(-rem[active], kind='stable')]
+        pct[by_remainder[:shortfall]] += 1
+        normalized_pct = {_PHASE_TIERS[idx]: int(pct[idx]) for idx in active}
         
         genre_focus = movie_signature.get('genre_focus', 'cinematic moments')
         lead_name = movie_signature.get('lead') or 'the ensemble cast'
@@ -164,7 +468,7 @@ class RolloutPlanner:
         title_short = movie_signature.get('title', 'the film')
         
         def _phase_duration(start: datetime) -> int:
-            return max(1, math.ceil((release_date - start).days / 7))
+            return max(1, (max(0, (release_date - start).days) + 6) // 7)
         
         # Phase 1: Tier A (Primary markets) - Start immediately
         if tier_a:
@@ -172,17 +476,17 @@ class RolloutPlanner:
                 f"Position {title_short} as the must-see {movie_signature.get('primary_genre', '').lower()} event. "
                 f"Lead with {genre_focus} and {lead_name} interviews to rally {audience} and drive premium pre-sales."
             ).strip()
-            phases.append({
-                'phase': len(phases) + 1,
-                'name': f"{movie_signature.get('primary_genre', 'Priority')} Fan Ignition",
-                'start_date': start_date.strftime('%Y-%m-%d'),
-                'duration_weeks': _phase_duration(start_date),
-                'regions': [r['region'] for r in tier_a],
-                'intensity': 'High',
-                'focus': focus_text,
-                'budget_percentage': normalized_pct.get('A', 0),
-                'movie_hook': hook
-            })
+            phases.append(PhaseRecord(
+                phase=len(phases) + 1,
+                name=f"{movie_signature.get('primary_genre', 'Priority')} Fan Ignition",
+                start_date=start_label,
+                duration_weeks=_phase_duration(start_date),
+                regions=list(tier_a),
+                intensity='High',
+                focus=focus_text,
+                budget_percentage=normalized_pct.get('A', 0),
+                movie_hook=hook
+            ))
         
         # Phase 2: Tier B expansion
         if tier_b and start_date < release_date:
@@ -193,17 +497,17 @@ class RolloutPlanner:
                     f"Capitalize on Tier-A reactions by localizing social proof clips, critic quotes, and {hook.lower()} callouts. "
                     f"Balance paid reach with experiential moments for regional partners."
                 )
-                phases.append({
-                    'phase': len(phases) + 1,
-                    'name': "Social Proof Expansion",
-                    'start_date': phase_start.strftime('%Y-%m-%d'),
-                    'duration_weeks': _phase_duration(phase_start),
-                    'regions': [r['region'] for r in tier_b],
-                    'intensity': 'Medium',
-                    'focus': focus_text,
-                    'budget_percentage': normalized_pct.get('B', 0),
-                    'movie_hook': f"Localized {genre_focus}"
-                })
+                phases.append(PhaseRecord(
+                    phase=len(phases) + 1,
+                    name="Social Proof Expansion",
+                    start_date=phase_start.strftime('%Y-%m-%d'),
+                    duration_weeks=_phase_duration(phase_start),
+                    regions=list(tier_b),
+                    intensity='Medium',
+                    focus=focus_text,
+                    budget_percentage=normalized_pct.get('B', 0),
+                    movie_hook=f"Localized {genre_focus}"
+                ))
         
         # Phase 3: Long-tail + tier C
         if tier_c and start_date < release_date:
@@ -214,149 +518,119 @@ class RolloutPlanner:
                     f"Keep {title_short} top-of-mind with cost-efficient retargeting, fan community drops, "
                     f"and partner bundles that celebrate {genre_focus}."
                 )
-                phases.append({
-                    'phase': len(phases) + 1,
-                    'name': "Long-tail Sustain & Emerging Markets",
-                    'start_date': phase_start.strftime('%Y-%m-%d'),
-                    'duration_weeks': _phase_duration(phase_start),
-                    'regions': [r['region'] for r in tier_c],
-                    'intensity': 'Low',
-                    'focus': focus_text,
-                    'budget_percentage': normalized_pct.get('C', 0),
-                    'movie_hook': f"Community-driven {title_short}"
-                })
+                phases.append(PhaseRecord(
+                    phase=len(phases) + 1,
+                    name="Long-tail Sustain & Emerging Markets",
+                    start_date=phase_start.strftime('%Y-%m-%d'),
+                    duration_weeks=_phase_duration(phase_start),
+                    regions=list(tier_c),
+                    intensity='Low',
+                    focus=focus_text,
+                    budget_percentage=normalized_pct.get('C', 0),
+                    movie_hook=f"Community-driven {title_short}"
+                ))
         
         return phases
     
     def _allocate_budget(
         self,
-        ranked_regions: List[Dict[str, Any]],
+        ranked: RankedRegions,
         total_budget: float
     ) -> List[Dict[str, Any]]:
         """Allocate budget across regions."""
-        allocations = []
-        
-        # Use suggested percentages from scoring
-        total_pct = sum(r['suggested_budget_pct'] for r in ranked_regions)
-        
-        for region_data in ranked_regions:
-            # Normalize percentage
-            pct = (region_data['suggested_budget_pct'] / total_pct * 100) if total_pct > 0 else 0
-            amount = (pct / 100) * total_budget
-            
-            allocations.append({
-                'region': region_data['region'],
-                'budget_amount': round(amount, 2),
-                'percentage': round(pct, 2),
-                'tier': region_data['tier'],
-                'justification': region_data['recommendation']
-            })
+        # Use suggested percentages from scoring, normalized in one vectorized pass
+        pcts = ranked.pcts
+        total_pct = pcts.sum()
+        norm = pcts / total_pct * 100.0 if total_pct > 0 else np.zeros_like(pcts)
+        amounts = np.round(norm / 100.0 * total_budget, 2)
+        norm = np.round(norm, 2)
+        
+        allocations = [
+            {
+                'region': region,
+                'budget_amount': amount,
+                'percentage': pct,
+                'tier': tier,
+                'justification': rec
+            }
+            for region, tier, rec, amount, pct in zip(
+                ranked.regions.tolist(), ranked.tiers.tolist(), ranked.recs,
+                amounts.tolist(), norm.tolist()
+            )
+        ]
         
         return sorted(allocations, key=lambda x: x['budget_amount'], reverse=True)
     
     def _create_timeline(
         self,
-        phases: List[Dict[str, Any]],
+        phases: List[PhaseRecord],
         start_date: datetime,
         release_date: datetime
-    ) -> List[Dict[str, Any]]:
+    ) -> List[TimelineWeek]:
         """Create week-by-week timeline."""
-        timeline = []
-        current = start_date
-        week = 1
+        # Parse phase start dates once; stable sort keeps list order on ties
+        phase_starts = sorted(
+            ((datetime.fromisoformat(p.start_date), p) for p in phases),
+            key=lambda item: item[0]
+        )
+        ordered_phases = [p for _, p in phase_starts]
         
-        while current < release_date:
-            week_end = min(current + timedelta(days=7), release_date)
-            
-            # Determine active phase
-            active_phase = None
-            for phase in phases:
-                phase_start = datetime.strptime(phase['start_date'], '%Y-%m-%d')
-                if phase_start <= current:
-                    active_phase = phase
-            
-            # Determine activities based on weeks to release
-            weeks_to_release = (release_date - current).days // 7
-            activities = self._get_weekly_activities(weeks_to_release)
-            
-            timeline.append({
-                'week': week,
-                'start_date': current.strftime('%Y-%m-%d'),
-                'end_date': week_end.strftime('%Y-%m-%d'),
-                'phase': active_phase['name'] if active_phase else 'Pre-campaign',
-                'active_regions': active_phase['regions'] if active_phase else [],
-                'key_activities': activities,
-                'intensity': active_phase['intensity'] if active_phase else 'Low'
-            })
-            
-            current = week_end
-            week += 1
+        span = release_date - start_date
+        total_weeks = -(-span // timedelta(days=7)) if span > timedelta(0) else 0
+        offsets = np.arange(total_weeks) * np.timedelta64(7, 'D')
+        
+        # Week boundaries as ISO date strings, computed in one vectorized step
+        first_day = np.datetime64(start_date.date())
+        week_starts = first_day + offsets
+        week_ends = np.minimum(week_starts + np.timedelta64(7, 'D'), np.datetime64(release_date.date()))
+        start_labels = week_starts.astype(str).tolist()
+        end_labels = week_ends.astype(str).tolist()
+        
+        # Active phase per week (latest phase already started)
+        phase_keys = np.array([ps for ps, _ in phase_starts], dtype='datetime64[us]')
+        week_moments = np.datetime64(start_date, 'us') + offsets
+        phase_idx = (np.searchsorted(phase_keys, week_moments, side='right') - 1).tolist()
+        
+        # Activity bucket per week based on weeks to release
+        weeks_to_release = span.days // 7 - np.arange(total_weeks)
+        activity_idx = np.digitize(weeks_to_release, _WEEKLY_ACTIVITY_THRESHOLDS).tolist()
+        
+        timeline = []
+        for week, (week_start, week_end, p_idx, a_idx) in enumerate(
+            zip(start_labels, end_labels, phase_idx, activity_idx), start=1
+        ):
+            active_phase = ordered_phases[p_idx] if p_idx >= 0 else None
+            timeline.append(TimelineWeek(
+                week=week,
+                start_date=week_start,
+                end_date=week_end,
+                phase=active_phase.name if active_phase else 'Pre-campaign',
+                active_regions=active_phase.regions if active_phase else [],
+                key_activities=_WEEKLY_ACTIVITIES[a_idx],
+                intensity=active_phase.intensity if active_phase else 'Low'
+            ))
         
         return timeline
     
-    def _get_weekly_activities(self, weeks_to_release: int) -> List[str]:
-        """Get recommended activities based on weeks until release."""
-        if weeks_to_release >= 6:
-            return [
-                "Launch teaser campaign",
-                "Build social media presence",
-                "Secure media partnerships"
-            ]
-        elif weeks_to_release >= 4:
-            return [
-                "Release official trailer",
-                "Start paid social campaigns",
-                "Begin PR tour"
-            ]
-        elif weeks_to_release >= 2:
-            return [
-                "Intensify digital ads",
-                "Launch ticket pre-sales",
-                "Host premiere events"
-            ]
-        else:
-            return [
-                "Final push - all channels",
-                "Leverage reviews & testimonials",
-                "Drive ticket sales"
-            ]
-    
     def _recommend_channels(
         self,
-        ranked_regions: List[Dict[str, Any]]
+        tier_buckets: Dict[str, List[str]]
     ) -> Dict[str, Any]:
         """Recommend marketing channels by region tier."""
         return {
             'tier_a_regions': {
-                'regions': [r['region'] for r in ranked_regions if r['tier'] == 'A'],
-                'channels': [
-                    'TV spots (prime time)',
-                    'YouTube pre-roll',
-                    'Instagram/Facebook ads',
-                    'Outdoor billboards (major cities)',
-                    'Influencer partnerships',
-                    'Podcast sponsorships'
-                ],
+                'regions': list(tier_buckets['A']),
+                'channels': _TIER_A_CHANNELS,
                 'investment_level': 'High'
             },
             'tier_b_regions': {
-                'regions': [r['region'] for r in ranked_regions if r['tier'] == 'B'],
-                'channels': [
-                    'Digital video ads',
-                    'Social media ads',
-                    'Streaming platform ads',
-                    'Local radio spots'
-                ],
+                'regions': list(tier_buckets['B']),
+                'channels': _TIER_B_CHANNELS,
                 'investment_level': 'Medium'
             },
             'tier_c_regions': {
-                'regions': [r['region'] for r in ranked_regions if r['tier'] == 'C'],
-                'channels': [
-                    'Social media organic',
-                    'Display ads',
-                    'Email campaigns',
-                    'Search engine marketing'
-                ],
+                'regions': list(tier_buckets['C']),
+                'channels': _TIER_C_CHANNELS,
                 'investment_level': 'Low-Medium'
             }
         }
@@ -364,68 +638,70 @@ class RolloutPlanner:
     def _generate_milestones(
         self,
         start_date: datetime,
-        release_date: datetime
-    ) -> List[Dict[str, Any]]:
+        release_date: datetime,
+        start_label: str,
+        release_label: str
+    ) -> List[Milestone]:
         """Generate key campaign milestones."""
         milestones = []
         
         # Campaign launch
-        milestones.append({
-            'date': start_date.strftime('%Y-%m-%d'),
-            'milestone': 'Campaign Launch',
-            'description': 'Teaser release, social media kickoff'
-        })
+        milestones.append(Milestone(
+            date=start_label,
+            milestone='Campaign Launch',
+            description='Teaser release, social media kickoff'
+        ))
         
         # Trailer release (4 weeks before)
         trailer_date = release_date - timedelta(weeks=4)
         if trailer_date > start_date:
-            milestones.append({
-                'date': trailer_date.strftime('%Y-%m-%d'),
-                'milestone': 'Official Trailer Release',
-                'description': 'Major media push, paid amplification'
-            })
+            milestones.append(Milestone(
+                date=trailer_date.strftime('%Y-%m-%d'),
+                milestone='Official Trailer Release',
+                description='Major media push, paid amplification'
+            ))
         
         # Ticket pre-sales (2 weeks before)
         presale_date = release_date - timedelta(weeks=2)
         if presale_date > start_date:
-            milestones.append({
-                'date': presale_date.strftime('%Y-%m-%d'),
-                'milestone': 'Ticket Pre-Sales Open',
-                'description': 'Drive early bookings, create urgency'
-            })
+            milestones.append(Milestone(
+                date=presale_date.strftime('%Y-%m-%d'),
+                milestone='Ticket Pre-Sales Open',
+                description='Drive early bookings, create urgency'
+            ))
         
         # Premiere (1 week before)
         premiere_date = release_date - timedelta(weeks=1)
         if premiere_date > start_date:
-            milestones.append({
-                'date': premiere_date.strftime('%Y-%m-%d'),
-                'milestone': 'World Premiere',
-                'description': 'Red carpet event, press coverage, reviews'
-            })
+            milestones.append(Milestone(
+                date=premiere_date.strftime('%Y-%m-%d'),
+                milestone='World Premiere',
+                description='Red carpet event, press coverage, reviews'
+            ))
         
         # Release day
-        milestones.append({
-            'date': release_date.strftime('%Y-%m-%d'),
-            'milestone': '🎬 RELEASE DAY',
-            'description': 'Full availability, maximize opening weekend'
-        })
-        
-        return sorted(milestones, key=lambda x: x['date'])
+        milestones.append(Milestone(
+            date=release_label,
+            milestone='🎬 RELEASE DAY',
+            description='Full availability, maximize opening weekend'
+        ))
+        
+        # Appended in chronological order: each guard keeps dates after launch
+        return milestones
 
     def _derive_campaign_parameters(
         self,
         movie_profile: Dict[str, Any],
-        regional_summary: Optional[Dict[str, Any]],
+        summary: RegionalSummary,
         override_budget: Optional[float],
         override_duration: Optional[int],
-        release_dt: datetime
+        release_dt: datetime,
+        release_label: str
     ) -> Dict[str, Any]:
         """Derive dynamic budget and campaign duration based on movie signals."""
-        ranked_regions = (regional_summary or {}).get('ranked_regions', [])
-        tier_a_count = len([r for r in ranked_regions if r.get('tier') == 'A'])
-        tier_b_count = len([r for r in ranked_regions if r.get('tier') == 'B'])
-        top_scores = [r.get('total_score', 0) for r in ranked_regions][:3]
-        interest_index = (sum(top_scores) / len(top_scores) / 100) if top_scores else 0.55
+        tier_a_count = summary.tier_a_count
+        tier_b_count = summary.tier_b_count
+        interest_index = summary.top3_mean / 100 if summary.top3_mean is not None else 0.55
         
         try:
             popularity = float(movie_profile.get('popularity', 45) or 45)
@@ -438,7 +714,7 @@ class RolloutPlanner:
             production_budget = 0.0
         
         release_gap_days = max(0, (release_dt - datetime.now()).days)
-        release_gap_weeks = math.ceil(release_gap_days / 7) if release_gap_days else 0
+        release_gap_weeks = (release_gap_days + 6) // 7
         
         # Duration logic
         duration_logic: List[str] = []
@@ -470,50 +746,41 @@ class RolloutPlanner:
             total_budget_value = int(override_budget)
             budget_logic.append(f"Budget overridden upstream at ${total_budget_value:,.0f}.")
         else:
+            try:
+                vote_count = int(movie_profile.get('vote_count') or 0)
+            except (TypeError, ValueError):
+                vote_count = 0
+            
+            (
+                budget_value,
+                marketing_ratio,
+                popularity_factor,
+                tier_factor,
+                interest_factor,
+                audience_factor
+            ) = _budget_core(
+                production_budget,
+                popularity,
+                tier_a_count,
+                tier_b_count,
+                interest_index,
+                min(vote_count, 50000)
+            )
+            total_budget_value = int(budget_value)
+            
             if production_budget > 0:
-                if production_budget >= 150_000_000:
-                    marketing_ratio = 0.4
-                elif production_budget >= 75_000_000:
-                    marketing_ratio = 0.32
-                elif production_budget >= 25_000_000:
-                    marketing_ratio = 0.25
-                else:
-                    marketing_ratio = 0.18
-                base_budget = production_budget * marketing_ratio
                 budget_logic.append(
                     f"Used {int(marketing_ratio * 100)}% of ${production_budget:,.0f} production budget as marketing baseline."
                 )
             else:
-                base_budget = 350000
                 budget_logic.append("No production budget reported, starting from $350K indie baseline.")
-            
-            pop_score = max(0.0, min(popularity, 100.0))
-            popularity_factor = 1 + (pop_score / 100) * 0.35
-            base_budget *= popularity_factor
-            if pop_score:
+            if popularity > 0:
                 budget_logic.append(f"Popularity score {popularity:.0f} adds {((popularity_factor - 1) * 100):.0f}% hype premium.")
-            
-            tier_factor = 1 + min(tier_a_count, 4) * 0.08 + min(tier_b_count, 4) * 0.03
-            base_budget *= tier_factor
             budget_logic.append(f"Tier mix ({tier_a_count} Tier-A / {tier_b_count} Tier-B) drives {tier_factor:.2f}x geographic weighting.")
-            
-            interest_factor = 1 + max(0, interest_index - 0.55) * 0.5
-            base_budget *= interest_factor
             budget_logic.append(f"Regional interest index {interest_index * 100:.0f} => {interest_factor:.2f}x demand lift.")
-            
-            try:
-                vote_count = int(movie_profile.get('vote_count') or 0)
-            except (TypeError, ValueError):
-                vote_count = 0
             if vote_count:
-                audience_factor = 1 + min(vote_count / 50000, 1) * 0.15
-                base_budget *= audience_factor
                 budget_logic.append(f"{vote_count:,} fan ratings justify {audience_factor:.2f}x proof-of-fanbase boost.")
-            
-            computed_budget = max(250000, min(base_budget, 20000000))
-            total_budget_value = max(250000, int(round(computed_budget / 50000) * 50000))
         
-        release_label = release_dt.strftime('%Y-%m-%d')
         movie_title = movie_profile.get('title', 'the film')
         logic = {
             'summary': f"Budget and timeline tuned for {movie_title} based on production scale and market demand.",
@@ -564,36 +831,6 @@ class RolloutPlanner:
             genres = [g.get('name') for g in genres if isinstance(g, dict) and g.get('name')]
         primary_genre = genres[0] if genres else 'Event'
         
-        genre_focus_map = {
-            'Action': 'high-impact action beats',
-            'Adventure': 'world-building spectacle',
-            'Science Fiction': 'immersive sci-fi worldbuilding',
-            'Fantasy': 'mythic fantasy imagery',
-            'Animation': 'signature animation style',
-            'Drama': 'character-driven drama',
-            'Comedy': 'sharp comedic timing',
-            'Horror': 'edge-of-seat suspense',
-            'Thriller': 'white-knuckle thrills',
-            'Romance': 'sweeping romantic stakes',
-            'Documentary': 'truth-first storytelling'
-        }
-        genre_focus = genre_focus_map.get(primary_genre, f"{primary_genre.lower()} energy")
-        
-        audience_map = {
-            'Action': 'action seekers',
-            'Adventure': 'genre fans',
-            'Science Fiction': 'sci-fi faithful',
-            'Fantasy': 'fantasy fandoms',
-            'Animation': 'family audiences',
-            'Drama': 'prestige audiences',
-            'Comedy': 'comedy lovers',
-            'Horror': 'thrill seekers',
-            'Thriller': 'thriller fans',
-            'Romance': 'date-night audiences',
-            'Documentary': 'non-fiction fans'
-        }
-        audience_callout = audience_map.get(primary_genre, f"{primary_genre.lower()} fans")
-        
         cast_entries = movie_profile.get('cast') or []
         cast_names: List[str] = []
         for entry in cast_entries:
@@ -615,23 +852,14 @@ class RolloutPlanner:
             lead = directors[0]
         
         tagline = movie_profile.get('tagline') or ''
-        if tagline:
-            hook = tagline
-        elif lead:
-            hook = f"{lead}'s {primary_genre.lower()} turn"
-        else:
-            hook = f"fan-favorite {primary_genre.lower()} moments"
         
-        return {
-            'title': title,
-            'primary_genre': primary_genre,
-            'genre_focus': genre_focus,
-            'hook': hook,
-            'lead': lead or 'the ensemble cast',
-            'tagline': tagline,
-            'audience_callout': audience_callout,
-            'supporting': supporting
-        }
+        fields = (title, primary_genre, lead, tagline, tuple(supporting))
+        try:
+            signature = _compute_signature(*fields)
+        except TypeError:
+            # Unhashable profile values (e.g. director dicts) skip the cache
+            signature = _compute_signature.__wrapped__(*fields)
+        return {**signature, 'supporting': list(signature['supporting'])}
 
 
 # Example usage
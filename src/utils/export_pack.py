@@ -3,22 +3,165 @@
 from __future__ import annotations
 
 import csv
+import hashlib
 import io
 import json
 import re
+import threading
 import zipfile
-from datetime import datetime
+from collections import OrderedDict
+from datetime import date, datetime
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Zstandard zip method id; zipfile supports it natively on Python 3.14+
+ZIP_ZSTANDARD = getattr(zipfile, 'ZIP_ZSTANDARD', 93)
+NATIVE_ZSTANDARD = hasattr(zipfile, 'ZIP_ZSTANDARD')
+ZSTANDARD_LEVEL = 3
+# Level 1 is ~3x faster than the default 6 for a near-identical text archive
+DEFLATE_LEVEL = 1
+
+# Fixed entry timestamp (the zip epoch) so identical campaigns give identical archives
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Finished zip archives kept per campaign/compression settings
+_PACK_CACHE_SIZE = 32
+
+# Collapse line breaks and tabs so multi-line copy stays on one CSV row
+_CLEAN = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' '})
+
+# Bundle contents listed in metadata.json (both JSON encoders emit tuples as arrays)
+_ASSET_NAMES = (
+    'ad_copy_ab.csv',
+    'social_posts.csv',
+    'email_campaign.md',
+    'storyboard.json',
+    'thumbnail_brief.md',
+    'rollout_plan.csv',
+    'citations.json'
+)
+
+# Storyboard frame directions, cycled by frame index (length must stay 4)
+_VISUAL_PALETTE = (
+    "High-energy montage of hero shots",
+    "Character close-up with moody lighting",
+    "World-building wide shot with typography overlay",
+    "Fan/community oriented collage"
+)
+
+if ORJSON_AVAILABLE:
+    def _dumps(payload: Any) -> bytes:
+        """Serialize to indented UTF-8 JSON bytes."""
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+else:
+    def _dumps(payload: Any) -> bytes:
+        """Serialize to indented UTF-8 JSON bytes."""
+        return json.dumps(payload, indent=2, ensure_ascii=False).encode('utf-8')
+
+if ORJSON_AVAILABLE:
+    def _campaign_digest(campaign: Dict[str, Any], *settings: Any) -> bytes:
+        """Stable hash of a campaign payload plus archive settings and derived values."""
+        digest = hashlib.blake2b(
+            orjson.dumps(campaign, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS),
+            digest_size=16
+        )
+        digest.update(repr(settings).encode('utf-8'))
+        return digest.digest()
+else:
+    def _campaign_digest(campaign: Dict[str, Any], *settings: Any) -> bytes:
+        """Stable hash of a campaign payload plus archive settings and derived values."""
+        digest = hashlib.blake2b(
+            json.dumps(campaign, default=str, sort_keys=True).encode('utf-8'),
+            digest_size=16
+        )
+        digest.update(repr(settings).encode('utf-8'))
+        return digest.digest()
+
+# Characters allowed in the bundle title: ASCII word chars, hyphen, space
+_SAFE_TITLE_RE = re.compile(r'[^\w\- ]+', re.ASCII)
+
+# Hand-rolled CSV rendering for the small fixed-schema exports; flip off to
+# fall back to the csv module
+_FAST_CSV = True
+_CSV_SPECIAL = re.compile(r'[",\r\n]')
+
+
+def _csv_escape(value: Any) -> str:
+    """Format one field the way csv.writer does with QUOTE_MINIMAL."""
+    if value is None:
+        return ''
+    text = value if isinstance(value, str) else str(value)
+    if _CSV_SPECIAL.search(text):
+        return '"%s"' % text.replace('"', '""')
+    return text
+
+
+def _render_csv(header: Tuple[str, ...], rows: List[Tuple[Any, ...]]) -> str:
+    """Render a header and rows as excel-dialect CSV text."""
+    if _FAST_CSV:
+        lines = [','.join(map(_csv_escape, row)) for row in (header, *rows)]
+        lines.append('')
+        return '\r\n'.join(lines)
+    
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return output.getvalue()
 
 
 class ExportPackBuilder:
     """Create a zipped asset bundle for a generated campaign."""
     
-    def __init__(self, campaign: Dict[str, Any]):
+    # Shared across builders: campaign digest -> finished zip bytes (LRU)
+    _pack_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+    _pack_cache_lock = threading.Lock()
+    
+    def __init__(
+        self,
+        campaign: Dict[str, Any],
+        compression: int = zipfile.ZIP_DEFLATED,
+        compresslevel: int = DEFLATE_LEVEL
+    ):
+        """
+        Args:
+            campaign: Generated campaign payload
+            compression: zipfile compression method (ZIP_ZSTANDARD stores
+                per-asset ``.zst`` files when zipfile lacks native support)
+            compresslevel: Deflate level for ZIP_DEFLATED (1 = fast, 9 = archival)
+        """
         self.campaign = campaign or {}
         self.movie = self.campaign.get('movie_data', {})
         self.rollout = self.campaign.get('rollout_plan', {})
+        self.compression = compression
+        self.compresslevel = compresslevel
+        
+        # Derived once and shared by the asset generators
+        self._release_date = self.movie.get('release_date') or ''
+        self._cta = self._cta_for_release(self._release_date)
+        self._primary = self._primary_genre()
+        self._generated_at = self.campaign.get('generated_at') or datetime.now().isoformat()
+        self._zstd_fallback = False
+        
+        if compression == ZIP_ZSTANDARD and not NATIVE_ZSTANDARD:
+            if ZSTANDARD_AVAILABLE:
+                self._zstd_fallback = True
+            else:
+                print("⚠️  zstandard not installed, falling back to ZIP_DEFLATED. Install with: pip install zstandard")
+                self.compression = zipfile.ZIP_DEFLATED
     
     def build(
         self,
@@ -31,100 +174,164 @@ class ExportPackBuilder:
         """
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as archive:
-            self._write_contents(archive)
+        output_path.write_bytes(self.build_bytes())
         
         return str(output_path)
     
     def build_bytes(self) -> bytes:
-        """Build the export pack and return the bytes."""
+        """Build the export pack and return the bytes (cached per campaign)."""
+        key = self._cache_key()
+        cache = ExportPackBuilder._pack_cache
+        with self._pack_cache_lock:
+            data = cache.get(key)
+            if data is not None:
+                cache.move_to_end(key)
+                return data
+        
         buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        with self._open_archive(buffer) as archive:
             self._write_contents(archive)
-        buffer.seek(0)
-        return buffer.read()
+        data = buffer.getvalue()
+        
+        with self._pack_cache_lock:
+            cache[key] = data
+            if len(cache) > _PACK_CACHE_SIZE:
+                cache.popitem(last=False)
+        return data
+    
+    def invalidate(self) -> None:
+        """Drop the cached archive for this campaign so the next build regenerates it."""
+        with self._pack_cache_lock:
+            ExportPackBuilder._pack_cache.pop(self._cache_key(), None)
     
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
+    def _cache_key(self) -> bytes:
+        # The CTA depends on today's date and generated_at may default to now,
+        # so both are part of the key rather than read from the campaign alone
+        return _campaign_digest(
+            self.campaign,
+            self.compression,
+            self.compresslevel,
+            self._zstd_fallback,
+            self._cta,
+            self._generated_at
+        )
+    
+    def _open_archive(self, target: Union[Path, io.BytesIO]) -> zipfile.ZipFile:
+        if self._zstd_fallback:
+            # Entries are zstd-compressed up front and stored as-is
+            return zipfile.ZipFile(target, 'w', zipfile.ZIP_STORED)
+        if self.compression == ZIP_ZSTANDARD:
+            return zipfile.ZipFile(target, 'w', self.compression, compresslevel=ZSTANDARD_LEVEL)
+        if self.compression == zipfile.ZIP_DEFLATED:
+            return zipfile.ZipFile(target, 'w', self.compression, compresslevel=self.compresslevel)
+        return zipfile.ZipFile(target, 'w', self.compression)
+    
+    def _zip_info(self, name: str, compress_type: int) -> zipfile.ZipInfo:
+        zinfo = zipfile.ZipInfo(name, date_time=_ZIP_DATE_TIME)
+        zinfo.compress_type = compress_type
+        zinfo.external_attr = 0o600 << 16
+        return zinfo
+    
+    def _put(
+        self,
+        archive: zipfile.ZipFile,
+        name: str,
+        data: bytes
+    ) -> None:
+        """Write a single encoded asset into the archive."""
+        # writestr never reserves ZIP64 extra fields for in-memory data
+        archive.writestr(self._zip_info(name, archive.compression), data, compresslevel=archive.compresslevel)
+    
+    def _assets(self) -> List[Tuple[str, Callable[[], bytes]]]:
+        return [
+            ('ad_copy_ab.csv', self._ad_copy_csv),
+            ('social_posts.csv', self._social_posts_csv),
+            ('email_campaign.md', self._email_markdown),
+            ('storyboard.json', self._storyboard_json),
+            ('thumbnail_brief.md', self._thumbnail_brief_markdown),
+            ('rollout_plan.csv', self._rollout_csv),
+            ('citations.json', self._citations_json),
+            ('metadata.json', lambda: _dumps(self._metadata())),
+        ]
+    
     def _write_contents(self, archive: zipfile.ZipFile) -> None:
-        archive.writestr('ad_copy_ab.csv', self._ad_copy_csv())
-        archive.writestr('social_posts.csv', self._social_posts_csv())
-        archive.writestr('email_campaign.md', self._email_markdown())
-        archive.writestr('storyboard.json', self._storyboard_json())
-        archive.writestr('thumbnail_brief.md', self._thumbnail_brief_markdown())
-        archive.writestr('rollout_plan.csv', self._rollout_csv())
-        archive.writestr('citations.json', self._citations_json())
-        archive.writestr('metadata.json', json.dumps(self._metadata(), indent=2))
+        assets = self._assets()
+        
+        if not self._zstd_fallback:
+            for name, producer in assets:
+                self._put(archive, name, producer())
+            return
+        
+        # Assets are a few KB each, so compress sequentially rather than on a thread pool
+        compressor = zstandard.ZstdCompressor(level=ZSTANDARD_LEVEL)
+        for name, producer in assets:
+            self._put(archive, f"{name}.zst", compressor.compress(producer()))
     
-    def _ad_copy_csv(self) -> str:
+    def _ad_copy_csv(self) -> bytes:
         """Return CSV content for A/B ad copy variants."""
-        output = io.StringIO()
-        fieldnames = ['label', 'variant', 'length', 'platform', 'text']
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
+        return _render_csv(*self._ad_copy_rows()).encode('utf-8')
+    
+    def _ad_copy_rows(self) -> Tuple[Tuple[str, ...], List[Tuple[Any, ...]]]:
+        header = ('label', 'variant', 'length', 'platform', 'text')
+        rows = []
         
         ad_copy = self.campaign.get('ad_copy', {})
         base_variants = ad_copy.get('variants', [])
         ai_variants = ad_copy.get('ai_enhanced_variants', [])
-        combined = list(base_variants) + list(ai_variants)
         
         labels = ['A', 'B']
         written = 0
-        for label, variant in zip(labels, combined[:2]):
-            writer.writerow({
-                'label': label,
-                'variant': variant.get('variant', ''),
-                'length': variant.get('length', ''),
-                'platform': variant.get('platform', ''),
-                'text': variant.get('text', '').replace('\n', ' ')
-            })
+        for label, variant in zip(labels, islice(chain(base_variants, ai_variants), 2)):
+            get = variant.get
+            rows.append((
+                label,
+                get('variant', ''),
+                get('length', ''),
+                get('platform', ''),
+                get('text', '').translate(_CLEAN)
+            ))
             written += 1
         
         # Fallback placeholders if less than 2 variants exist
-        while written < 2:
-            writer.writerow({
-                'label': labels[written],
-                'variant': 'N/A',
-                'length': 'N/A',
-                'platform': '',
-                'text': 'No variant generated'
-            })
-            written += 1
+        rows.extend((label, 'N/A', 'N/A', '', 'No variant generated') for label in labels[written:])
         
-        return output.getvalue()
+        return header, rows
     
-    def _social_posts_csv(self) -> str:
+    def _social_posts_csv(self) -> bytes:
         """Return CSV of social platform posts."""
-        output = io.StringIO()
-        fieldnames = ['platform', 'text', 'optimal_time', 'post_type', 'image_suggestion']
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
+        return _render_csv(*self._social_posts_rows()).encode('utf-8')
+    
+    def _social_posts_rows(self) -> Tuple[Tuple[str, ...], List[Tuple[Any, ...]]]:
+        header = ('platform', 'text', 'optimal_time', 'post_type', 'image_suggestion')
         
         social_posts = self.campaign.get('social_posts', {})
-        for platform, payload in social_posts.items():
-            if platform == 'generated_at':
-                continue
-            writer.writerow({
-                'platform': payload.get('platform', platform),
-                'text': payload.get('text', '').replace('\n', ' ').strip(),
-                'optimal_time': payload.get('optimal_time', ''),
-                'post_type': payload.get('post_type', ''),
-                'image_suggestion': payload.get('image_suggestion', '')
-            })
+        items = [(k, v) for k, v in social_posts.items() if k != 'generated_at']
+        rows = [
+            (
+                payload.get('platform', platform),
+                (payload.get('text') or '').translate(_CLEAN).strip(),
+                payload.get('optimal_time', ''),
+                payload.get('post_type', ''),
+                payload.get('image_suggestion', '')
+            )
+            for platform, payload in items
+        ]
         
-        return output.getvalue()
+        return header, rows
     
-    def _email_markdown(self) -> str:
+    def _email_markdown(self) -> bytes:
         """Generate a simple email asset."""
-        title = self.movie.get('title', 'This Film')
-        tagline = self.movie.get('tagline') or ''
-        release_date = self.movie.get('release_date') or 'TBD'
-        overview = (self.movie.get('overview') or '').strip()
-        cast = ', '.join(self.movie.get('cast', [])[:3])
+        mget = self.movie.get
+        title = mget('title', 'This Film')
+        tagline = mget('tagline') or ''
+        release_date = self._release_date or 'TBD'
+        overview = (mget('overview') or '').strip()
+        cast = ', '.join(mget('cast', [])[:3])
         
-        cta = self._cta_for_release(release_date)
+        cta = self._cta
         subject_a = f"{title}: {tagline}" if tagline else f"{title} arrives {release_date}"
         subject_b = f"{title} — {cta}"
         
@@ -133,7 +340,7 @@ class ExportPackBuilder:
             highlights.append(tagline)
         if cast:
             highlights.append(f"Starring {cast}")
-        genres = self.movie.get('genres')
+        genres = mget('genres')
         if genres:
             if isinstance(genres[0], dict):
                 genre_name = genres[0].get('name')
@@ -144,40 +351,31 @@ class ExportPackBuilder:
         
         body_intro = overview or f"{title} is gearing up for release on {release_date}."
         
-        lines = [
-            f"# Email Campaign: {title}",
-            "",
-            f"**Subject Line A:** {subject_a}",
-            f"**Subject Line B:** {subject_b}",
-            "",
-            f"**Preview Text:** {title} lands {release_date}. {cta}.",
-            "",
-            "Hi {{FirstName}},",
-            "",
-            body_intro,
-            "",
-            "Key highlights:",
-        ]
-        
-        if highlights:
-            for highlight in highlights:
-                lines.append(f"- {highlight}")
-        else:
-            lines.append("- Exclusive first look at the film.")
+        highlights_md = "\n".join(f"- {h}" for h in highlights) or "- Exclusive first look at the film."
         
-        lines.extend([
-            "",
-            f"Ready to secure your seats? {cta}.",
-            "",
-            "Best,",
-            "The Campaign Team"
-        ])
-        
-        return "\n".join(lines)
+        return f"""# Email Campaign: {title}
+
+**Subject Line A:** {subject_a}
+**Subject Line B:** {subject_b}
+
+**Preview Text:** {title} lands {release_date}. {cta}.
+
+Hi {{{{FirstName}}}},
+
+{body_intro}
+
+Key highlights:
+{highlights_md}
+
+Ready to secure your seats? {cta}.
+
+Best,
+The Campaign Team""".encode('utf-8')
     
-    def _storyboard_json(self) -> str:
+    def _storyboard_json(self) -> bytes:
         """Generate storyboard frames derived from rollout phases."""
-        title = self.movie.get('title', 'This Film')
+        mget = self.movie.get
+        title = mget('title', 'This Film')
         frames = []
         
         phases = self.rollout.get('phases', [])
@@ -202,70 +400,70 @@ class ExportPackBuilder:
         
         payload = {
             'title': title,
-            'release_date': self.movie.get('release_date'),
+            'release_date': mget('release_date'),
             'frames': frames
         }
-        return json.dumps(payload, indent=2)
+        return _dumps(payload)
     
-    def _thumbnail_brief_markdown(self) -> str:
+    def _thumbnail_brief_markdown(self) -> bytes:
         """Return markdown instructions for thumbnail creation."""
         title = self.movie.get('title', 'This Film')
-        primary_genre = self._primary_genre()
+        primary_genre = self._primary
         tagline = self.movie.get('tagline') or ''
         cast = ', '.join(self.movie.get('cast', [])[:2])
         
-        lines = [
-            f"# Thumbnail Brief — {title}",
-            "",
-            f"**Tone/Genre:** {primary_genre}",
-            f"**Tagline/Hook:** {tagline or 'Use bold text to tease the conflict or stakes.'}",
-            "",
-            "## Visual Directions",
-            "- High contrast still of the lead with cinematic lighting",
-            "- Layer subtle grain or texture for a premium feel",
-            "- Include release date badge in a corner",
-            "",
-            "## Text Overlay Options",
-            f"- \"{title}\" large with secondary line \"{self._cta_for_release(self.movie.get('release_date') or '')}\"",
-            "- Use angle brackets or slashes to hint at motion/action",
-            "",
-            "## Talent / Elements",
-            f"- Priority cast: {cast or 'Use key art silhouettes if cast unavailable.'}",
-            "- Background motif inspired by primary location or genre iconography",
-            "",
-            "## Color Palette",
-            "- Accent: Electric violet or fiery orange for CTA badge",
-            "- Base: Deep navy/charcoal to keep text legible",
-        ]
-        return "\n".join(lines)
+        hook = tagline or 'Use bold text to tease the conflict or stakes.'
+        talent = cast or 'Use key art silhouettes if cast unavailable.'
+        
+        return f"""# Thumbnail Brief — {title}
+
+**Tone/Genre:** {primary_genre}
+**Tagline/Hook:** {hook}
+
+## Visual Directions
+- High contrast still of the lead with cinematic lighting
+- Layer subtle grain or texture for a premium feel
+- Include release date badge in a corner
+
+## Text Overlay Options
+- "{title}" large with secondary line "{self._cta}"
+- Use angle brackets or slashes to hint at motion/action
+
+## Talent / Elements
+- Priority cast: {talent}
+- Background motif inspired by primary location or genre iconography
+
+## Color Palette
+- Accent: Electric violet or fiery orange for CTA badge
+- Base: Deep navy/charcoal to keep text legible""".encode('utf-8')
     
-    def _rollout_csv(self) -> str:
+    def _rollout_csv(self) -> bytes:
         """Convert rollout timeline to CSV."""
-        output = io.StringIO()
-        fieldnames = [
+        return _render_csv(*self._rollout_rows()).encode('utf-8')
+    
+    def _rollout_rows(self) -> Tuple[Tuple[str, ...], List[Tuple[Any, ...]]]:
+        header = (
             'week', 'start_date', 'end_date', 'phase',
             'intensity', 'regions', 'activities'
-        ]
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
+        )
         
         timeline = self.rollout.get('timeline', [])
-        for entry in timeline:
-            regions = entry.get('active_regions') or []
-            activities = entry.get('key_activities') or []
-            writer.writerow({
-                'week': entry.get('week'),
-                'start_date': entry.get('start_date'),
-                'end_date': entry.get('end_date'),
-                'phase': entry.get('phase'),
-                'intensity': entry.get('intensity'),
-                'regions': ', '.join(regions),
-                'activities': ' | '.join(activities)
-            })
+        rows = [
+            (
+                entry.get('week'),
+                entry.get('start_date'),
+                entry.get('end_date'),
+                entry.get('phase'),
+                entry.get('intensity'),
+                ', '.join(entry.get('active_regions') or []),
+                ' | '.join(entry.get('key_activities') or [])
+            )
+            for entry in timeline
+        ]
         
-        return output.getvalue()
+        return header, rows
     
-    def _citations_json(self) -> str:
+    def _citations_json(self) -> bytes:
         """Return citations JSON extracted from the ad copy source tracker."""
         ad_copy = self.campaign.get('ad_copy', {})
         details = ad_copy.get('source_details') or {}
@@ -276,31 +474,23 @@ class ExportPackBuilder:
             except json.JSONDecodeError:
                 parsed = {'raw': details}
         elif isinstance(details, dict):
-            parsed = details
+            # Copy so the caller's campaign (and its cache key) is left untouched
+            parsed = dict(details)
         else:
             parsed = {}
         
         parsed['citation_strings'] = ad_copy.get('sources', [])
-        return json.dumps(parsed, indent=2)
+        return _dumps(parsed)
     
     def _metadata(self) -> Dict[str, Any]:
         """High-level metadata for the bundle."""
         title = self.movie.get('title', 'campaign')
-        safe_title = re.sub(r'[^A-Za-z0-9\\-_ ]+', '', title).strip()
-        generated_at = self.campaign.get('generated_at') or datetime.now().isoformat()
+        safe_title = _SAFE_TITLE_RE.sub('', title).strip()
         
         return {
             'title': safe_title or 'campaign',
-            'generated_at': generated_at,
-            'assets': [
-                'ad_copy_ab.csv',
-                'social_posts.csv',
-                'email_campaign.md',
-                'storyboard.json',
-                'thumbnail_brief.md',
-                'rollout_plan.csv',
-                'citations.json'
-            ]
+            'generated_at': self._generated_at,
+            'assets': _ASSET_NAMES
         }
     
     def _primary_genre(self) -> str:
@@ -313,24 +503,22 @@ class ExportPackBuilder:
         return first
     
     def _visual_direction(self, idx: int) -> str:
-        palette = [
-            "High-energy montage of hero shots",
-            "Character close-up with moody lighting",
-            "World-building wide shot with typography overlay",
-            "Fan/community oriented collage"
-        ]
-        return palette[(idx - 1) % len(palette)]
+        return _VISUAL_PALETTE[(idx - 1) & 3]
     
     def _cta_for_release(self, release_date: str) -> str:
         """Choose CTA language based on release window."""
         if not release_date:
             return "Learn more"
         try:
-            release = datetime.strptime(release_date, '%Y-%m-%d')
-            now = datetime.now()
-            if release <= now:
+            try:
+                release = date.fromisoformat(release_date)
+            except ValueError:
+                # Slow path for dates without zero padding, e.g. '2026-1-5'
+                release = datetime.strptime(release_date, '%Y-%m-%d').date()
+            today = date.today()
+            if release <= today:
                 return "Watch now"
-            elif (release - now).days <= 21:
+            elif (release - today).days <= 21:
                 return "Get tickets"
             else:
                 return f"Coming {release.strftime('%b %d')}"